@@ -6,11 +6,15 @@ Production-grade suppression and priority logic for accurate root cause attribut
 """
 
 import click
+import json
 import sys
 import yaml
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, List, Any, Set, Tuple
+from typing import Optional, Dict, List, Any, Set, Tuple, Iterator, Callable
 
 from .parsers.langfuse import LangfuseParser
 from .detectors.retry_loops import RetryLoopDetector
@@ -19,7 +23,7 @@ from .detectors.fallback_failure import FallbackFailureDetector
 from .detectors.overkill_model_detector import OverkillModelDetector
 from .reporters.slack_formatter import SlackFormatter
 from .reporters.markdown_formatter import MarkdownFormatter
-from .reporters.summary_formatter import SummaryFormatter
+from .reporters.summary_formatter import SummaryFormatter, WasteTally
 
 # 🔢 1. DETECTOR PRIORITIES - Global constant used throughout
 DETECTOR_PRIORITY = {
@@ -29,6 +33,14 @@ DETECTOR_PRIORITY = {
     'OverkillModelDetector': 4,   # Overkill for simple tasks - lowest priority
 }
 
+# Keys of each detector's section under suppression_rules in crashlens-policy.yaml
+DETECTOR_CONFIG_KEYS = {
+    'RetryLoopDetector': 'retry_loop',
+    'FallbackStormDetector': 'fallback_storm',
+    'FallbackFailureDetector': 'fallback_failure',
+    'OverkillModelDetector': 'overkill_model',
+}
+
 # Detector display names for output formatting
 DETECTOR_DISPLAY_NAMES = {
     'RetryLoopDetector': 'Retry Loop',
@@ -38,6 +50,36 @@ DETECTOR_DISPLAY_NAMES = {
 }
 
 
+@dataclass(slots=True)
+class SuppressedDetection:
+    """A suppressed detection: the original detection plus suppression metadata, without copying it"""
+    base: Dict[str, Any]
+    suppressed_by: str
+    suppression_reason: str
+    detector: str
+    
+    def __getitem__(self, key: str) -> Any:
+        if key in ('suppressed_by', 'suppression_reason', 'detector'):
+            return getattr(self, key)
+        return self.base[key]
+    
+    def __contains__(self, key: str) -> bool:
+        return key in ('suppressed_by', 'suppression_reason', 'detector') or key in self.base
+    
+    def keys(self) -> List[str]:
+        return [*(k for k in self.base.keys() if k not in ('suppressed_by', 'suppression_reason', 'detector')),
+                'suppressed_by', 'suppression_reason', 'detector']
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
 class SuppressionEngine:
     """
     🧰 3. Production-grade suppression engine with trace-level ownership
@@ -49,8 +91,22 @@ class SuppressionEngine:
         
         # 🧠 2. Trace-Level Ownership: {trace_id: claimed_by_detector}
         self.trace_ownership: Dict[str, str] = {}
-        self.suppressed_detections: List[Dict[str, Any]] = []
-        self.active_detections: List[Dict[str, Any]] = []
+        self.suppressed_detections: List[SuppressedDetection] = []
+        self._active_detections: List[Dict[str, Any]] = []
+        
+        # Active detections bucketed per trace as (detector_name, detection),
+        # so an ownership transfer only touches the affected trace
+        self.active_by_trace: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+        # id()s of superseded detections still awaiting removal from _active_detections
+        self._superseded_ids: Set[int] = set()
+    
+    @property
+    def active_detections(self) -> List[Dict[str, Any]]:
+        """Active detections, with superseded ones dropped lazily"""
+        if self._superseded_ids:
+            self._active_detections = [d for d in self._active_detections if id(d) not in self._superseded_ids]
+            self._superseded_ids.clear()
+        return self._active_detections
     
     def process_detections(self, detector_name: str, detections: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -58,6 +114,8 @@ class SuppressionEngine:
         Returns active detections, stores suppressed ones
         """
         active = []
+        detector_name = sys.intern(detector_name)
+        current_priority = DETECTOR_PRIORITY.get(detector_name, 999)
         
         for detection in detections:
             trace_id = detection.get('trace_id')
@@ -73,7 +131,6 @@ class SuppressionEngine:
             # Check trace ownership and priority (only if not disabled by config)
             if trace_id in self.trace_ownership:
                 current_owner = self.trace_ownership[trace_id]
-                current_priority = DETECTOR_PRIORITY.get(detector_name, 999)
                 owner_priority = DETECTOR_PRIORITY.get(current_owner, 999)
                 
                 # 🧰 3. Suppression Hook: Priority-based suppression (configurable)
@@ -90,26 +147,16 @@ class SuppressionEngine:
             # This detection is active - claim ownership
             self.trace_ownership[trace_id] = detector_name
             detection['suppressed_by'] = None  # Mark as not suppressed
+            self.active_by_trace.setdefault(trace_id, []).append((detector_name, detection))
             active.append(detection)
         
         # Store active detections for this detector
-        self.active_detections.extend(active)
+        self._active_detections.extend(active)
         return active
     
     def _is_detector_suppressed(self, detector_name: str, trace_id: str) -> bool:
         """Check if detector is suppressed by configuration"""
-        # Get the detector config (remove 'Detector' suffix and convert to lowercase)
-        config_key = detector_name.lower().replace('detector', '').replace('_', '')
-        if config_key in ['retryloop']:
-            config_key = 'retry_loop'
-        elif config_key == 'fallbackstorm':
-            config_key = 'fallback_storm'
-        elif config_key == 'fallbackfailure':
-            config_key = 'fallback_failure'
-        elif config_key == 'overkillmodel':
-            config_key = 'overkill_model'
-        
-        detector_config = self.suppression_config.get(config_key, {})
+        detector_config = self.suppression_config.get(DETECTOR_CONFIG_KEYS.get(detector_name, detector_name), {})
         
         # Check suppression rules
         if detector_config.get('suppress_if_retry_loop', False):
@@ -119,18 +166,7 @@ class SuppressionEngine:
     
     def _should_suppress_by_priority(self, detector_name: str, current_priority: int, owner_priority: int) -> bool:
         """Check if detector should be suppressed by priority logic"""
-        # Get the detector config
-        config_key = detector_name.lower().replace('detector', '').replace('_', '')
-        if config_key in ['retryloop']:
-            config_key = 'retry_loop'
-        elif config_key == 'fallbackstorm':
-            config_key = 'fallback_storm'
-        elif config_key == 'fallbackfailure':
-            config_key = 'fallback_failure'
-        elif config_key == 'overkillmodel':
-            config_key = 'overkill_model'
-        
-        detector_config = self.suppression_config.get(config_key, {})
+        detector_config = self.suppression_config.get(DETECTOR_CONFIG_KEYS.get(detector_name, detector_name), {})
         
         # If suppress_if_retry_loop is False, allow coexistence (no priority suppression)
         if not detector_config.get('suppress_if_retry_loop', True):
@@ -141,41 +177,33 @@ class SuppressionEngine:
     
     def _add_suppressed_detection(self, detection: Dict[str, Any], detector_name: str, reason: str):
         """Add detection to suppressed list with metadata"""
-        suppressed = detection.copy()
-        suppressed['suppressed_by'] = detector_name
-        suppressed['suppression_reason'] = reason
-        suppressed['detector'] = detector_name
-        self.suppressed_detections.append(suppressed)
+        self.suppressed_detections.append(SuppressedDetection(detection, detector_name, reason, detector_name))
     
     def _transfer_ownership(self, trace_id: str, old_owner: str, new_owner: str):
         """Transfer ownership and move old detections to suppressed"""
-        # Find active detections from old owner for this trace
-        to_suppress = []
-        remaining_active = []
+        remaining = []
         
-        for detection in self.active_detections:
-            if detection.get('trace_id') == trace_id and detection.get('type', '').replace('_', '').replace(' ', '').lower() in old_owner.lower():
-                to_suppress.append(detection)
+        # Only the old owner's detections for this trace are superseded
+        for owner, detection in self.active_by_trace.get(trace_id, []):
+            if owner == old_owner:
+                self._add_suppressed_detection(detection, old_owner, f"superseded_by:{new_owner}")
+                self._superseded_ids.add(id(detection))
             else:
-                remaining_active.append(detection)
-        
-        # Move old detections to suppressed
-        for detection in to_suppress:
-            self._add_suppressed_detection(detection, old_owner, f"superseded_by:{new_owner}")
+                remaining.append((owner, detection))
         
-        self.active_detections = remaining_active
+        self.active_by_trace[trace_id] = remaining
     
     def get_suppression_summary(self) -> Dict[str, Any]:
         """Generate suppression summary for transparency"""
-        total_traces = len(set(d.get('trace_id') for d in self.active_detections + self.suppressed_detections if d.get('trace_id')))
+        trace_ids = {d.get('trace_id') for d in self.active_detections}
+        trace_ids.update(s.base.get('trace_id') for s in self.suppressed_detections)
+        trace_ids.discard(None)
+        total_traces = len(trace_ids)
         active_issues = len(self.active_detections)
         suppressed_count = len(self.suppressed_detections)
         
         # Group suppressed by reason
-        suppression_breakdown = {}
-        for detection in self.suppressed_detections:
-            reason = detection.get('suppression_reason', 'unknown')
-            suppression_breakdown[reason] = suppression_breakdown.get(reason, 0) + 1
+        suppression_breakdown = Counter(s.suppression_reason for s in self.suppressed_detections)
         
         return {
             'total_traces_analyzed': total_traces,
@@ -186,15 +214,58 @@ class SuppressionEngine:
         }
 
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+CONFIG_DIR = Path(__file__).parent / "config"
+# Seconds a bundled YAML may be newer than its JSON copy and still count as converted:
+# checkouts and installs write each YAML just after the JSON next to it
+_CONFIG_MTIME_SLACK = 2.0
+
+
+@lru_cache(maxsize=8)
+def _load_config_cached(path: Path, mtime: float) -> Any:
+    """Parse a JSON or YAML file once per (path, mtime); the result is shared and must not be mutated"""
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.suffix == '.json':
+            return json.load(f)
+        return yaml.load(f, Loader=_YAML_LOADER)
+
+
+def _load_config(config_path: Path) -> Any:
+    """Load a JSON or YAML config file, reusing the parsed result while the file is unchanged"""
+    path = Path(config_path).resolve()
+    return _load_config_cached(path, path.stat().st_mtime)
+
+
+def _bundled_config_path(yaml_name: str, config_dir: Path = CONFIG_DIR) -> Path:
+    """
+    Bundled config file to load: the JSON copy shipped next to the YAML source
+    (much faster to parse), or the YAML itself if there is no JSON copy or the
+    YAML has been edited since the copy was generated
+    """
+    yaml_path = config_dir / yaml_name
+    json_path = yaml_path.with_suffix('.json')
+    try:
+        json_mtime = json_path.stat().st_mtime
+    except OSError:
+        return yaml_path
+    try:
+        if yaml_path.stat().st_mtime > json_mtime + _CONFIG_MTIME_SLACK:
+            return yaml_path
+    except OSError:
+        pass
+    return json_path
+
+
 def load_suppression_config(config_path: Optional[Path] = None) -> Dict[str, Any]:
     """📜 4. Load suppression rules from crashlens-policy.yaml"""
     if config_path is None:
-        config_path = Path(__file__).parent / "config" / "crashlens-policy.yaml"
+        config_path = _bundled_config_path("crashlens-policy.yaml")
     
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            policy = yaml.safe_load(f)
-            return policy.get('suppression_rules', {})
+        policy = _load_config(config_path)
+        return policy.get('suppression_rules', {})
     except Exception:
         return {}  # Default to no suppression rules
 
@@ -202,11 +273,10 @@ def load_suppression_config(config_path: Optional[Path] = None) -> Dict[str, Any
 def load_pricing_config(config_path: Optional[Path] = None) -> Dict[str, Any]:
     """Load pricing configuration from YAML file"""
     if config_path is None:
-        config_path = Path(__file__).parent / "config" / "pricing.yaml"
+        config_path = _bundled_config_path("pricing.yaml")
     
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+        return _load_config(config_path)
     except Exception as e:
         click.echo(f"⚠️  Warning: Could not load pricing config: {e}", err=True)
         return {}
@@ -384,6 +454,106 @@ def _calculate_trace_time_span(records: List[Dict[str, Any]]) -> float:
         return 0.0
 
 
+def _bind_detect(detector: Any) -> Callable[..., List[Dict[str, Any]]]:
+    """Resolve once how a detector is called: call(traces, model_pricing, already_flagged)"""
+    if not hasattr(detector, 'detect'):
+        return lambda traces, model_pricing, already_flagged: []
+    if 'already_flagged_ids' in detector.detect.__code__.co_varnames:
+        # Detector supports suppression
+        return lambda traces, model_pricing, already_flagged: detector.detect(traces, model_pricing, already_flagged)
+    # Basic detector
+    return lambda traces, model_pricing, already_flagged: detector.detect(traces, model_pricing)
+
+
+def _build_detectors(thresholds: Dict[str, Any]) -> List[Tuple[str, Any, Callable[..., List[Dict[str, Any]]]]]:
+    """Build (detector_name, detector, call) triples in priority order from configured thresholds"""
+    detectors = [
+        ('RetryLoopDetector', RetryLoopDetector(
+            max_retries=thresholds.get('retry_loop', {}).get('max_retries', 3),
+            time_window_minutes=thresholds.get('retry_loop', {}).get('time_window_minutes', 5),
+            max_retry_interval_minutes=thresholds.get('retry_loop', {}).get('max_retry_interval_minutes', 2)
+        )),
+        ('FallbackStormDetector', FallbackStormDetector(
+            min_calls=thresholds.get('fallback_storm', {}).get('min_calls', 3),
+            min_models=thresholds.get('fallback_storm', {}).get('min_models', 2),
+            max_trace_window_minutes=thresholds.get('fallback_storm', {}).get('max_trace_window_minutes', 3)
+        )),
+        ('FallbackFailureDetector', FallbackFailureDetector(
+            time_window_seconds=thresholds.get('fallback_failure', {}).get('time_window_seconds', 300)
+        )),
+        ('OverkillModelDetector', OverkillModelDetector(
+            max_prompt_tokens=thresholds.get('overkill_model', {}).get('max_prompt_tokens', 20),
+            max_prompt_chars=thresholds.get('overkill_model', {}).get('max_prompt_chars', 150)
+        ))
+    ]
+    return [(detector_name, detector, _bind_detect(detector)) for detector_name, detector in detectors]
+
+
+def _can_trigger(detector: Any, parse_stats: Optional[Dict[str, int]]) -> bool:
+    """
+    Whether any parsed trace has enough calls and the features a detector needs to flag it
+    
+    Every detector declares min_calls and required_features; a missing one raises.
+    """
+    required = detector.required_features
+    if parse_stats is None:
+        return True
+    return (parse_stats['max_events_per_trace'] >= detector.min_calls
+            and parse_stats['features_seen'] & required == required)
+
+
+def _iter_detections(
+    detector_configs: List[Tuple[str, Any, Callable[..., List[Dict[str, Any]]]]],
+    traces: Dict[str, List[Dict[str, Any]]],
+    feature_masks: Dict[str, int],
+    model_pricing: Dict[str, Any],
+    suppression_engine: SuppressionEngine,
+    parse_stats: Optional[Dict[str, int]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Run detectors in priority order through the suppression engine, yielding active detections
+    
+    Detectors that no parsed trace could trigger are skipped without being called.
+    """
+    for detector_name, detector, call in detector_configs:
+        try:
+            if not _can_trigger(detector, parse_stats):
+                continue
+            
+            # Only hand the detector traces that have the features it needs
+            required = detector.required_features
+            if required:
+                candidates = {trace_id: records for trace_id, records in traces.items()
+                              if feature_masks.get(trace_id, 0) & required == required}
+            else:
+                candidates = traces
+            
+            # Run detector - a live keys view, as ownership only changes after detect() returns
+            already_flagged = suppression_engine.trace_ownership.keys()
+            raw_detections = call(candidates, model_pricing, already_flagged)
+            
+            # Process through suppression engine
+            active_detections = suppression_engine.process_detections(detector_name, raw_detections)
+            
+        except Exception as e:
+            click.echo(f"⚠️  Warning: {detector_name} failed: {e}", err=True)
+            continue
+        
+        yield from active_detections
+
+
+def _run_detectors(
+    detector_configs: List[Tuple[str, Any, Callable[..., List[Dict[str, Any]]]]],
+    traces: Dict[str, List[Dict[str, Any]]],
+    feature_masks: Dict[str, int],
+    model_pricing: Dict[str, Any],
+    suppression_engine: SuppressionEngine,
+    parse_stats: Optional[Dict[str, int]] = None
+) -> List[Dict[str, Any]]:
+    """Run detectors in priority order through the suppression engine, returning active detections"""
+    return list(_iter_detections(detector_configs, traces, feature_masks, model_pricing, suppression_engine, parse_stats))
+
+
 @click.group()
 @click.version_option(version="0.1.0")
 def cli():
@@ -529,56 +699,17 @@ def scan(logfile: Optional[Path] = None, output_format: str = 'slack', config: O
     
     # Handle summary modes
     if summary or summary_only:
-        # Run detectors to get waste analysis
-        all_active_detections = []
-        
-        # Load thresholds from pricing config
-        thresholds = pricing_config.get('thresholds', {})
-        
-        # Run detectors in priority order
-        detector_configs = [
-            ('RetryLoopDetector', RetryLoopDetector(
-                max_retries=thresholds.get('retry_loop', {}).get('max_retries', 3),
-                time_window_minutes=thresholds.get('retry_loop', {}).get('time_window_minutes', 5),
-                max_retry_interval_minutes=thresholds.get('retry_loop', {}).get('max_retry_interval_minutes', 2)
-            )),
-            ('FallbackStormDetector', FallbackStormDetector(
-                min_calls=thresholds.get('fallback_storm', {}).get('min_calls', 3),
-                min_models=thresholds.get('fallback_storm', {}).get('min_models', 2),
-                max_trace_window_minutes=thresholds.get('fallback_storm', {}).get('max_trace_window_minutes', 3)
-            )),
-            ('FallbackFailureDetector', FallbackFailureDetector(
-                time_window_seconds=thresholds.get('fallback_failure', {}).get('time_window_seconds', 300)
-            )),
-            ('OverkillModelDetector', OverkillModelDetector(
-                max_prompt_tokens=thresholds.get('overkill_model', {}).get('max_prompt_tokens', 20),
-                max_prompt_chars=thresholds.get('overkill_model', {}).get('max_prompt_chars', 150)
-            ))
-        ]
-        
-        # Process each detector
-        for detector_name, detector in detector_configs:
-            try:
-                if hasattr(detector, 'detect'):
-                    if 'already_flagged_ids' in detector.detect.__code__.co_varnames:
-                        already_flagged = set(suppression_engine.trace_ownership.keys())
-                        raw_detections = detector.detect(traces, pricing_config.get('models', {}), already_flagged)
-                    else:
-                        raw_detections = detector.detect(traces, pricing_config.get('models', {}))
-                else:
-                    raw_detections = []
-                
-                # Process through suppression engine
-                active_detections = suppression_engine.process_detections(detector_name, raw_detections)
-                all_active_detections.extend(active_detections)
-                
-            except Exception as e:
-                click.echo(f"⚠️  Warning: {detector_name} failed: {e}", err=True)
-                continue
+        # Stream detections into the summary's running waste tallies
+        tally = WasteTally()
+        for detection in _iter_detections(
+            _build_detectors(pricing_config.get('thresholds', {})),
+            traces, parser.feature_masks, pricing_config.get('models', {}), suppression_engine, parser.parse_stats
+        ):
+            tally.feed(detection)
         
         # Use SummaryFormatter for cost breakdown with waste analysis
         summary_formatter = SummaryFormatter()
-        output = summary_formatter.format(traces, pricing_config.get('models', {}), summary_only, all_active_detections)
+        output = summary_formatter.format_tally(traces, pricing_config.get('models', {}), tally, summary_only)
         
         # Write to report.md
         report_path = Path.cwd() / "report.md"
@@ -590,54 +721,11 @@ def scan(logfile: Optional[Path] = None, output_format: str = 'slack', config: O
         click.echo(output)
         return output
     
-    # Load thresholds from pricing config
-    thresholds = pricing_config.get('thresholds', {})
-    
     # 🔢 1. Run detectors in priority order with suppression
-    detector_configs = [
-        ('RetryLoopDetector', RetryLoopDetector(
-            max_retries=thresholds.get('retry_loop', {}).get('max_retries', 3),
-            time_window_minutes=thresholds.get('retry_loop', {}).get('time_window_minutes', 5),
-            max_retry_interval_minutes=thresholds.get('retry_loop', {}).get('max_retry_interval_minutes', 2)
-        )),
-        ('FallbackStormDetector', FallbackStormDetector(
-            min_calls=thresholds.get('fallback_storm', {}).get('min_calls', 3),
-            min_models=thresholds.get('fallback_storm', {}).get('min_models', 2),
-            max_trace_window_minutes=thresholds.get('fallback_storm', {}).get('max_trace_window_minutes', 3)
-        )),
-        ('FallbackFailureDetector', FallbackFailureDetector(
-            time_window_seconds=thresholds.get('fallback_failure', {}).get('time_window_seconds', 300)
-        )),
-        ('OverkillModelDetector', OverkillModelDetector(
-            max_prompt_tokens=thresholds.get('overkill_model', {}).get('max_prompt_tokens', 20),
-            max_prompt_chars=thresholds.get('overkill_model', {}).get('max_prompt_chars', 150)
-        ))
-    ]
-    
-    all_active_detections = []
-    
-    # Process each detector in priority order
-    for detector_name, detector in detector_configs:
-        try:
-            # Run detector
-            if hasattr(detector, 'detect'):
-                if 'already_flagged_ids' in detector.detect.__code__.co_varnames:
-                    # Detector supports suppression
-                    already_flagged = set(suppression_engine.trace_ownership.keys())
-                    raw_detections = detector.detect(traces, pricing_config.get('models', {}), already_flagged)
-                else:
-                    # Basic detector
-                    raw_detections = detector.detect(traces, pricing_config.get('models', {}))
-            else:
-                raw_detections = []
-            
-            # Process through suppression engine
-            active_detections = suppression_engine.process_detections(detector_name, raw_detections)
-            all_active_detections.extend(active_detections)
-            
-        except Exception as e:
-            click.echo(f"⚠️  Warning: {detector_name} failed: {e}", err=True)
-            continue
+    all_active_detections = _run_detectors(
+        _build_detectors(pricing_config.get('thresholds', {})),
+        traces, parser.feature_masks, pricing_config.get('models', {}), suppression_engine, parser.parse_stats
+    )
     
     # Get suppression summary
     suppression_summary = suppression_engine.get_suppression_summary()
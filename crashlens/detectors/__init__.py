@@ -1,2 +1,3 @@
 from .retry_loops import RetryLoopDetector
-from .fallback_storm import FallbackStormDetector 
\ No newline at end of file
+from .fallback_storm import FallbackStormDetector 
+from .detection import Detection
\ No newline at end of file
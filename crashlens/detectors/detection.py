@@ -0,0 +1,73 @@
+"""
+Detection
+Result record shared by all detectors
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, Iterator, List
+
+
+# Keys every detection carries, stored as slots rather than in details
+_FIELD_NAMES = ('type', 'trace_id', 'severity', 'description', 'waste_cost', 'waste_tokens', 'suppressed_by')
+_FIELDS = frozenset(_FIELD_NAMES)
+
+
+@dataclass(slots=True)
+class Detection:
+    """
+    A single detector finding
+
+    Detector-specific extras (sample_prompt, records, model_used, ...) live in details.
+    Supports the dict-style access reporters rely on: d['key'], d.get(), 'key' in d, d['key'] = value.
+    """
+    type: str
+    trace_id: Optional[str] = None
+    severity: str = 'medium'
+    description: str = ''
+    waste_cost: float = 0.0
+    waste_tokens: int = 0
+    suppressed_by: Optional[str] = None
+    details: Dict[str, Any] = field(default_factory=dict)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _FIELDS:
+            return getattr(self, key)
+        return self.details[key]
+
+    def __setitem__(self, key: str, value: Any):
+        if key in _FIELDS:
+            setattr(self, key, value)
+        else:
+            self.details[key] = value
+
+    def __contains__(self, key: str) -> bool:
+        return key in _FIELDS or key in self.details
+
+    def keys(self) -> List[str]:
+        return [*_FIELD_NAMES, *self.details]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in _FIELDS:
+            return getattr(self, key)
+        return self.details.get(key, default)
+
+    def copy(self) -> 'Detection':
+        """Shallow copy, like dict.copy()"""
+        return Detection(self.type, self.trace_id, self.severity, self.description,
+                         self.waste_cost, self.waste_tokens, self.suppressed_by, self.details.copy())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict form of the detection"""
+        return {
+            'type': self.type,
+            'trace_id': self.trace_id,
+            'severity': self.severity,
+            'description': self.description,
+            'waste_cost': self.waste_cost,
+            'waste_tokens': self.waste_tokens,
+            'suppressed_by': self.suppressed_by,
+            **self.details
+        }
@@ -3,15 +3,20 @@ Fallback Failure Detector
 Detects redundant fallback calls to expensive models after successful cheaper model calls
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, AbstractSet
 from datetime import datetime, timedelta
 
+from .detection import Detection
+from ..parsers.langfuse import HAS_MODEL_SWITCH
+
 
 class FallbackFailureDetector:
     """Detects unnecessary fallback calls to expensive models after successful cheaper calls"""
     
     def __init__(self, time_window_seconds: int = 300):
         self.time_window = timedelta(seconds=time_window_seconds)
+        self.min_calls = 2  # A cheaper call followed by the fallback
+        self.required_features = HAS_MODEL_SWITCH  # Cheaper and expensive tiers never share a model
         
         # Define model tiers (cheaper to more expensive)
         self.cheaper_models = {
@@ -23,7 +28,7 @@ class FallbackFailureDetector:
             'claude-2.1', 'claude-2.0'
         }
     
-    def detect(self, traces: Dict[str, List[Dict[str, Any]]], model_pricing: Optional[Dict[str, Any]] = None, already_flagged_ids: Optional[set] = None) -> List[Dict[str, Any]]:
+    def detect(self, traces: Dict[str, List[Dict[str, Any]]], model_pricing: Optional[Dict[str, Any]] = None, already_flagged_ids: Optional[AbstractSet[str]] = None) -> List[Detection]:
         """Detect fallback failures across all traces"""
         detections = []
         if already_flagged_ids is None:
@@ -50,9 +55,9 @@ class FallbackFailureDetector:
         
         return [d for d in detections if d is not None]
     
-    def _find_fallback_failures(self, records: List[Dict[str, Any]], model_pricing: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    def _find_fallback_failures(self, records: List[Dict[str, Any]], model_pricing: Optional[Dict[str, Any]] = None) -> List[Detection]:
         """Find fallback failure patterns in sorted records"""
-        failures: List[Dict[str, Any]] = []
+        failures: List[Detection] = []
         
         for i in range(len(records) - 1):
             first_record = records[i]
@@ -141,7 +146,7 @@ class FallbackFailureDetector:
         except (ValueError, TypeError):
             return False
     
-    def _create_failure_detection(self, first_record: Dict[str, Any], second_record: Dict[str, Any], model_pricing: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    def _create_failure_detection(self, first_record: Dict[str, Any], second_record: Dict[str, Any], model_pricing: Optional[Dict[str, Any]] = None) -> Optional[Detection]:
         """Create a fallback failure detection object"""
         first_model = first_record.get('model') or first_record.get('input', {}).get('model', '')
         second_model = second_record.get('model') or second_record.get('input', {}).get('model', '')
@@ -196,23 +201,25 @@ class FallbackFailureDetector:
         except (ValueError, TypeError):
             pass
         
-        return {
-            'type': 'fallback_failure',
-            'detection_method': 'exact_match',
-            'severity': 'high' if fallback_cost > 0.01 else 'medium',
-            'description': f"Unnecessary fallback from {first_model} to {second_model}",
-            'model_tiers': f"{first_model} → {second_model}",
-            'waste_tokens': fallback_tokens,
-            'waste_cost': fallback_cost,
-            'primary_model': first_model,
-            'fallback_model': second_model,
-            'primary_prompt': first_prompt[:200] + '...' if len(first_prompt) > 200 else first_prompt,
-            'fallback_prompt': second_prompt[:200] + '...' if len(second_prompt) > 200 else second_prompt,
-            'time_between_calls': time_diff,
-            'primary_tokens': (
-                first_record.get('prompt_tokens', 0) + 
-                first_record.get('completion_tokens', 0)
-            ),
-            'fallback_tokens': fallback_tokens,
-            'records': [first_record, second_record]
-        }
\ No newline at end of file
+        return Detection(
+            type='fallback_failure',
+            severity='high' if fallback_cost > 0.01 else 'medium',
+            description=f"Unnecessary fallback from {first_model} to {second_model}",
+            waste_tokens=fallback_tokens,
+            waste_cost=fallback_cost,
+            details={
+                'detection_method': 'exact_match',
+                'model_tiers': f"{first_model} → {second_model}",
+                'primary_model': first_model,
+                'fallback_model': second_model,
+                'primary_prompt': first_prompt[:200] + '...' if len(first_prompt) > 200 else first_prompt,
+                'fallback_prompt': second_prompt[:200] + '...' if len(second_prompt) > 200 else second_prompt,
+                'time_between_calls': time_diff,
+                'primary_tokens': (
+                    first_record.get('prompt_tokens', 0) + 
+                    first_record.get('completion_tokens', 0)
+                ),
+                'fallback_tokens': fallback_tokens,
+                'records': [first_record, second_record]
+            }
+        )
\ No newline at end of file
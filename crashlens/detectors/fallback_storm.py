@@ -3,9 +3,12 @@ Fallback Storm Detector - OSS v0.1 Minimal Implementation
 Detects chaotic model switching and cost spikes within traces
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, AbstractSet
 from datetime import datetime, timedelta
 
+from .detection import Detection
+from ..parsers.langfuse import NO_FEATURES, HAS_MULTIPLE_CALLS, HAS_MODEL_SWITCH
+
 
 class FallbackStormDetector:
     """Detects fallback storms according to OSS v0.1 minimal checklist"""
@@ -21,9 +24,14 @@ class FallbackStormDetector:
         """
         self.min_calls = min_calls
         self.min_models = min_models
+        # Trace feature bits needed to be flagged
+        if min_models >= 2:
+            self.required_features = HAS_MODEL_SWITCH
+        else:
+            self.required_features = HAS_MULTIPLE_CALLS if min_calls >= 2 else NO_FEATURES
         self.max_trace_window = timedelta(minutes=max_trace_window_minutes)
     
-    def detect(self, traces: Dict[str, List[Dict[str, Any]]], model_pricing: Optional[Dict[str, Any]] = None, already_flagged_ids: Optional[set] = None) -> List[Dict[str, Any]]:
+    def detect(self, traces: Dict[str, List[Dict[str, Any]]], model_pricing: Optional[Dict[str, Any]] = None, already_flagged_ids: Optional[AbstractSet[str]] = None) -> List[Detection]:
         """
         Detect fallback storms according to OSS v0.1 minimal checklist
         
@@ -50,7 +58,7 @@ class FallbackStormDetector:
         
         return detections
     
-    def _check_storm_pattern(self, trace_id: str, records: List[Dict[str, Any]], model_pricing: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    def _check_storm_pattern(self, trace_id: str, records: List[Dict[str, Any]], model_pricing: Optional[Dict[str, Any]]) -> Optional[Detection]:
         """Check if trace matches fallback storm pattern according to checklist"""
         
         # 🔍 CHECKLIST 1: Same trace_id (already grouped)
@@ -93,21 +101,22 @@ class FallbackStormDetector:
             total_tokens += prompt_tokens + completion_tokens
         
         # 🖨️ CLI OUTPUT FORMAT: Return detection according to specification
-        return {
-            'type': 'fallback_storm',
-            'detector': 'fallback_storm',
-            'trace_id': trace_id,
-            'severity': 'high' if len(sorted_records) > 5 else 'medium',
-            'description': f"Fallback storm: {len(unique_models)} models used in {len(sorted_records)} calls",
-            'models_used': unique_models,
-            'num_calls': len(sorted_records),
-            'estimated_waste_usd': estimated_waste,
-            'waste_cost': estimated_waste,
-            'waste_tokens': total_tokens,
-            'suppressed_by': None,
-            'time_span': self._get_time_span_seconds(sorted_records),
-            'sample_prompt': sorted_records[0].get('prompt', '')[:100] + '...' if len(sorted_records[0].get('prompt', '')) > 100 else sorted_records[0].get('prompt', '')
-        }
+        return Detection(
+            type='fallback_storm',
+            trace_id=trace_id,
+            severity='high' if len(sorted_records) > 5 else 'medium',
+            description=f"Fallback storm: {len(unique_models)} models used in {len(sorted_records)} calls",
+            waste_cost=estimated_waste,
+            waste_tokens=total_tokens,
+            details={
+                'detector': 'fallback_storm',
+                'models_used': unique_models,
+                'num_calls': len(sorted_records),
+                'estimated_waste_usd': estimated_waste,
+                'time_span': self._get_time_span_seconds(sorted_records),
+                'sample_prompt': sorted_records[0].get('prompt', '')[:100] + '...' if len(sorted_records[0].get('prompt', '')) > 100 else sorted_records[0].get('prompt', '')
+            }
+        )
     
     def _within_time_window(self, records: List[Dict[str, Any]]) -> bool:
         """Check if all calls occurred within the time window"""
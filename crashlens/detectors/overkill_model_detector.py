@@ -6,7 +6,10 @@ Supports configurable thresholds, cost estimation, and routing suggestions.
 
 import re
 import json
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, AbstractSet
+
+from .detection import Detection
+from ..parsers.langfuse import NO_FEATURES
 
 
 class OverkillModelDetector:
@@ -30,6 +33,8 @@ class OverkillModelDetector:
         """
         self.max_prompt_tokens = max_prompt_tokens
         self.max_prompt_chars = max_prompt_chars
+        self.min_calls = 1  # Any single call can be overkill
+        self.required_features = NO_FEATURES  # Every trace is a candidate
         
         # 🧠 2. Configurable expensive models list
         self.expensive_models = expensive_models or [
@@ -56,7 +61,7 @@ class OverkillModelDetector:
             "claude-2.1": "claude-instant-1"
         }
     
-    def detect(self, traces: Dict[str, List[Dict[str, Any]]], model_pricing: Optional[Dict[str, Any]] = None, already_flagged_ids: Optional[set] = None) -> List[Dict[str, Any]]:
+    def detect(self, traces: Dict[str, List[Dict[str, Any]]], model_pricing: Optional[Dict[str, Any]] = None, already_flagged_ids: Optional[AbstractSet[str]] = None) -> List[Detection]:
         """
         Detect overkill model usage with enhanced cost estimation and routing suggestions
         
@@ -85,7 +90,7 @@ class OverkillModelDetector:
         
         return detections
     
-    def _check_overkill_pattern(self, trace_id: str, record: Dict[str, Any], model_pricing: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    def _check_overkill_pattern(self, trace_id: str, record: Dict[str, Any], model_pricing: Optional[Dict[str, Any]]) -> Optional[Detection]:
         """Check if a single record represents overkill model usage"""
         
         # ✅ CHECKLIST: Span uses expensive model - handle both field formats
@@ -134,24 +139,26 @@ class OverkillModelDetector:
         total_tokens = prompt_tokens_actual + completion_tokens
         
         # 💡 CLI OUTPUT: Return enhanced detection metadata with cost and routing info
-        return {
-            'type': 'overkill_model',
-            'trace_id': trace_id,
-            'severity': 'medium',
-            'model': model,
-            'prompt_tokens': prompt_tokens,
-            'prompt_length': len(prompt),
-            'reason': simple_reason,
-            'estimated_cost_usd': estimated_cost,
-            'suggested_model': suggested_model,
-            'potential_savings_usd': potential_savings,
-            'prompt_preview': prompt[:50] + "..." if len(prompt) > 50 else prompt,
-            'overkill_detected': True,
-            'description': f"Overkill: {model} used for simple task ({simple_reason})",
-            'waste_cost': estimated_cost * 0.7,  # Assume 70% could be saved with cheaper model
-            'waste_tokens': total_tokens,
-            'sample_prompt': prompt[:100] + '...' if len(prompt) > 100 else prompt
-        }
+        return Detection(
+            type='overkill_model',
+            trace_id=trace_id,
+            severity='medium',
+            description=f"Overkill: {model} used for simple task ({simple_reason})",
+            waste_cost=estimated_cost * 0.7,  # Assume 70% could be saved with cheaper model
+            waste_tokens=total_tokens,
+            details={
+                'model': model,
+                'prompt_tokens': prompt_tokens,
+                'prompt_length': len(prompt),
+                'reason': simple_reason,
+                'estimated_cost_usd': estimated_cost,
+                'suggested_model': suggested_model,
+                'potential_savings_usd': potential_savings,
+                'prompt_preview': prompt[:50] + "..." if len(prompt) > 50 else prompt,
+                'overkill_detected': True,
+                'sample_prompt': prompt[:100] + '...' if len(prompt) > 100 else prompt
+            }
+        )
     
     def _is_expensive_model(self, model: str) -> bool:
         """Check if model is considered expensive for overkill detection"""
@@ -298,7 +305,7 @@ def detect_expensive_model_waste(
     completion_token_threshold: int = 100,
     min_tokens_for_gpt4: int = 100,
     model_pricing: Optional[Dict[str, Any]] = None
-) -> List[Dict[str, Any]]:
+) -> List[Detection]:
     """
     Detects wasteful use of expensive models for short/simple prompts.
     Only flags 'expensive_model_short' and recommends a cheaper model if appropriate.
@@ -325,19 +332,21 @@ def detect_expensive_model_waste(
                     suggested_model = expensive_models[model]
                     cheaper_cost = _calculate_cost_with_model(record, suggested_model, model_pricing)
                     potential_savings = max(0.0, current_cost - cheaper_cost)
-                    detections.append({
-                        'type': 'expensive_model_short',
-                        'trace_id': trace_id,
-                        'severity': 'medium',
-                        'description': f"{model.upper()} used for short prompt ({prompt_tokens} tokens)",
-                        'waste_tokens': record.get('completion_tokens', 0),
-                        'waste_cost': potential_savings,
-                        'prompt_length': prompt_tokens,
-                        'model_used': model,
-                        'suggested_model': suggested_model,
-                        'sample_prompt': prompt[:100] + '...' if len(prompt) > 100 else prompt,
-                        'records': [record]
-                    })
+                    detections.append(Detection(
+                        type='expensive_model_short',
+                        trace_id=trace_id,
+                        severity='medium',
+                        description=f"{model.upper()} used for short prompt ({prompt_tokens} tokens)",
+                        waste_tokens=record.get('completion_tokens', 0),
+                        waste_cost=potential_savings,
+                        details={
+                            'prompt_length': prompt_tokens,
+                            'model_used': model,
+                            'suggested_model': suggested_model,
+                            'sample_prompt': prompt[:100] + '...' if len(prompt) > 100 else prompt,
+                            'records': [record]
+                        }
+                    ))
     return [d for d in detections if d is not None]
 
 def _calculate_record_cost(record: Dict[str, Any], model_pricing: Optional[Dict[str, Any]]) -> float:
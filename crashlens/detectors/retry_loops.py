@@ -4,10 +4,13 @@ Detects patterns of repeated API calls that suggest retry loops using exact stri
 This version removes all semantic similarity and embedding logic.
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, AbstractSet
 from datetime import datetime, timedelta
 import logging
 
+from .detection import Detection
+from ..parsers.langfuse import HAS_MULTIPLE_CALLS
+
 class RetryLoopDetector:
     """
     Detects retry loops in API call traces using exact string matching.
@@ -30,10 +33,12 @@ class RetryLoopDetector:
             raise ValueError("max_retries must be at least 1.")
         
         self.max_retries = max_retries
+        self.min_calls = max_retries + 1  # Fewest calls in a trace that can be flagged
+        self.required_features = HAS_MULTIPLE_CALLS  # A loop needs more than max_retries (>= 1) calls
         self.time_window = timedelta(minutes=time_window_minutes)
         self.max_retry_interval = timedelta(minutes=max_retry_interval_minutes)
 
-    def detect(self, traces: Dict[str, List[Dict[str, Any]]], model_pricing: Optional[Dict[str, Any]] = None, already_flagged_ids: Optional[set] = None) -> List[Dict[str, Any]]:
+    def detect(self, traces: Dict[str, List[Dict[str, Any]]], model_pricing: Optional[Dict[str, Any]] = None, already_flagged_ids: Optional[AbstractSet[str]] = None) -> List[Detection]:
         """
         Analyzes all traces and detects retry loops based on exact string matching.
 
@@ -89,24 +94,26 @@ class RetryLoopDetector:
                     sample_prompt = group[0].get('prompt', 'N/A')
                     sample_model = group[0].get('model', 'N/A')
 
-                    detection = {
-                        'type': 'retry_loop',
-                        'trace_id': trace_id,
-                        'severity': 'high' if len(group) > 5 else 'medium',
-                        'description': (
+                    detection = Detection(
+                        type='retry_loop',
+                        trace_id=trace_id,
+                        severity='high' if len(group) > 5 else 'medium',
+                        description=(
                             f"Retry loop detected with {len(group)} identical calls "
                             f"using {sample_model} for the same prompt."
                         ),
-                        'waste_tokens': total_tokens,
-                        'waste_cost': total_cost,
-                        'retry_count': len(group),
-                        'model': sample_model,
-                        'time_span': f"{self._get_time_span(group):.1f} seconds",
-                        'sample_prompt': sample_prompt[:150] + ('...' if len(sample_prompt) > 150 else ''),
-                        'detection_method': 'exact_match',
-                        'has_small_responses': self._has_small_responses(group),
-                        'records': group
-                    }
+                        waste_tokens=total_tokens,
+                        waste_cost=total_cost,
+                        details={
+                            'retry_count': len(group),
+                            'model': sample_model,
+                            'time_span': f"{self._get_time_span(group):.1f} seconds",
+                            'sample_prompt': sample_prompt[:150] + ('...' if len(sample_prompt) > 150 else ''),
+                            'detection_method': 'exact_match',
+                            'has_small_responses': self._has_small_responses(group),
+                            'records': group
+                        }
+                    )
                     detections.append(detection)
 
         return detections
@@ -4,65 +4,113 @@ Parses Langfuse-style JSONL logs and groups by trace_id
 """
 
 import json
+import sys
+from collections import Counter
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterator
 from datetime import datetime
 import click
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+# Size of each raw read when streaming a log file from disk
+DEFAULT_CHUNK_SIZE = 65536
+
+# Per-trace feature bits, computed while parsing so detectors can skip traces they can never flag
+NO_FEATURES = 0            # Detector needs no features: every trace is a candidate
+HAS_MULTIPLE_CALLS = 0b01  # Trace has 2+ records
+HAS_MODEL_SWITCH = 0b10    # Trace uses 2+ distinct models
+
 
 class LangfuseParser:
     """Parser for Langfuse-style JSONL log files (newer style)"""
     
     def __init__(self):
         self.traces: Dict[str, List[Dict[str, Any]]] = {}
+        self.feature_masks: Dict[str, int] = {}
+        # File-wide totals from the last parse, so whole detectors can be skipped
+        self.parse_stats: Dict[str, int] = {'total_events': 0, 'max_events_per_trace': 0, 'features_seen': 0}
     
-    def parse_file(self, file_path: Path) -> Dict[str, List[Dict[str, Any]]]:
-        """Parse JSONL file and group by traceId"""
+    def parse_file(self, file_path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, List[Dict[str, Any]]]:
+        """Parse JSONL file and group by traceId, streaming it in fixed-size chunks"""
         self.traces.clear()
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return self._parse_lines(f)
+        self.feature_masks.clear()
+        with open(file_path, 'rb') as f:
+            return self._parse_lines(self._iter_lines(f, chunk_size))
     
     def parse_string(self, text: str) -> Dict[str, List[Dict[str, Any]]]:
         """Parse JSONL string and group by traceId"""
         self.traces.clear()
+        self.feature_masks.clear()
         lines = text.splitlines()
         return self._parse_lines(lines)
     
     def parse_stdin(self) -> Dict[str, List[Dict[str, Any]]]:
         """Parse JSONL from stdin and group by traceId"""
         self.traces.clear()
+        self.feature_masks.clear()
         import sys
         return self._parse_lines(sys.stdin)
 
+    @staticmethod
+    def _iter_lines(f, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        """Yield raw lines from a binary file without loading it whole"""
+        pending: List[bytes] = []
+        while chunk := f.read(chunk_size):
+            start = 0
+            while (end := chunk.find(b'\n', start)) != -1:
+                if pending:
+                    # Line started in an earlier chunk - only join when it completes
+                    pending.append(chunk[start:end])
+                    yield b''.join(pending)
+                    pending.clear()
+                else:
+                    yield chunk[start:end]
+                start = end + 1
+            if start < len(chunk):
+                pending.append(chunk[start:])
+        if pending:
+            yield b''.join(pending)
+
     def _extract_fields(self, record: dict) -> 'Optional[dict]':
         # No type check; accept all records
+        # Resolve each nested section once rather than once per field
+        input_ = record.get('input', {})
+        usage = record.get('usage', {})
+        metadata = record.get('metadata', {})
         return {
             'traceId': record.get('traceId'),
             'startTime': record.get('startTime'),
             'endTime': record.get('endTime'),
             'level': record.get('level'),
-            'model': record.get('input', {}).get('model'),
-            'prompt': record.get('input', {}).get('prompt'),
-            'prompt_tokens': record.get('usage', {}).get('prompt_tokens'),
-            'completion_tokens': record.get('usage', {}).get('completion_tokens'),
+            'model': input_.get('model'),
+            'prompt': input_.get('prompt'),
+            'prompt_tokens': usage.get('prompt_tokens'),
+            'completion_tokens': usage.get('completion_tokens'),
             'cost': record.get('cost'),  # Add cost field
-            'metadata.fallback_attempted': record.get('metadata', {}).get('fallback_attempted'),
-            'metadata.fallback_reason': record.get('metadata', {}).get('fallback_reason'), # optional
-            'metadata.route': record.get('metadata', {}).get('route'), # Add route field
-            'metadata.team': record.get('metadata', {}).get('team'), # Add team field
+            'metadata.fallback_attempted': metadata.get('fallback_attempted'),
+            'metadata.fallback_reason': metadata.get('fallback_reason'), # optional
+            'metadata.route': metadata.get('route'), # Add route field
+            'metadata.team': metadata.get('team'), # Add team field
             'name': record.get('name'), # optional
-            'metadata.source': record.get('metadata', {}).get('source'), # optional
+            'metadata.source': metadata.get('source'), # optional
         }
 
     def _parse_lines(self, lines) -> Dict[str, List[Dict[str, Any]]]:
         """Parse lines and group by traceId (newer style)"""
         required_fields = ['traceId', 'model', 'prompt', 'completion_tokens']
+        loads = _json_loads  # orjson parses raw bytes directly, no decode step
         for line_num, line in enumerate(lines, 1):
             line = line.strip()
             if not line:
                 continue
             try:
-                record = json.loads(line)
+                record = loads(line)
                 trace_id = record.get('traceId')
                 parsed = self._extract_fields(record)
                 # Check for required fields
@@ -72,12 +120,31 @@ class LangfuseParser:
                         click.echo(f"⚠️  Warning: Missing required field(s) {missing} on line {line_num}. Skipping.", err=True)
                         continue
                 if trace_id and parsed:
-                    if trace_id not in self.traces:
-                        self.traces[trace_id] = []
-                    self.traces[trace_id].append(parsed)
-            except json.JSONDecodeError as e:
+                    if type(trace_id) is str:
+                        # One shared key object per trace for every later dict lookup
+                        trace_id = parsed['traceId'] = sys.intern(trace_id)
+                    records = self.traces.get(trace_id)
+                    if records is None:
+                        self.traces[trace_id] = [parsed]
+                        self.feature_masks[trace_id] = 0
+                    else:
+                        mask = self.feature_masks[trace_id] | HAS_MULTIPLE_CALLS
+                        if parsed['model'] != records[0]['model']:
+                            mask |= HAS_MODEL_SWITCH
+                        self.feature_masks[trace_id] = mask
+                        records.append(parsed)
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
                 click.echo(f"⚠️  Warning: Invalid JSON on line {line_num}: {e}", err=True)
                 continue
+        
+        features_seen = 0
+        for mask in self.feature_masks.values():
+            features_seen |= mask
+        self.parse_stats = {
+            'total_events': sum(map(len, self.traces.values())),
+            'max_events_per_trace': max(map(len, self.traces.values()), default=0),
+            'features_seen': features_seen,
+        }
         return self.traces
     
     def get_trace_summary(self, trace_id: str) -> Dict[str, Any]:
@@ -90,7 +157,7 @@ class LangfuseParser:
         # Extract key metrics
         total_tokens = 0
         total_cost = 0.0
-        model_usage = {}
+        model_usage = Counter()
         
         for record in trace_records:
             # Extract token usage
@@ -102,10 +169,7 @@ class LangfuseParser:
                 total_cost += record.get('cost', 0.0)
             
             # Track model usage
-            model = record.get('model', 'unknown')
-            if model not in model_usage:
-                model_usage[model] = 0
-            model_usage[model] += 1
+            model_usage[record.get('model', 'unknown')] += 1
         
         return {
             'trace_id': trace_id,
@@ -3,7 +3,8 @@ Markdown Formatter
 Formats detection results in Markdown format for documentation
 """
 
-from typing import Dict, List, Any, Optional
+import io
+from typing import Dict, List, Any, Optional, Set
 from datetime import datetime
 from ..utils.pii_scrubber import PIIScrubber
 
@@ -116,6 +117,7 @@ class MarkdownFormatter:
     def _aggregate_detections(self, detections: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
         """Aggregate detections by detector type"""
         aggregated = {}
+        seen_trace_ids: Dict[str, Set[str]] = {}
         
         for detection in detections:
             # Get the proper detector name from the detection
@@ -136,8 +138,10 @@ class MarkdownFormatter:
             else:
                 detector = detector.replace('_', ' ').title()
             
-            if detector not in aggregated:
-                aggregated[detector] = {
+            group = aggregated.get(detector)
+            if group is None:
+                seen_trace_ids[detector] = set()
+                group = aggregated[detector] = {
                     'detector': detector,
                     'count': 0,
                     'total_waste_cost': 0.0,
@@ -147,35 +151,39 @@ class MarkdownFormatter:
                     'detections': []
                 }
             
-            group = aggregated[detector]
             group['count'] += 1
             group['total_waste_cost'] += detection.get('waste_cost', 0)
             group['total_waste_tokens'] += detection.get('waste_tokens', 0)
             group['detections'].append(detection)
             
-            # Add trace ID to the list
+            # Add trace ID to the list, deduplicated through a per-group set
             trace_id = detection.get('trace_id')
-            if trace_id and trace_id not in group['trace_ids']:
-                group['trace_ids'].append(trace_id)
+            if trace_id:
+                seen = seen_trace_ids[detector]
+                if trace_id not in seen:
+                    seen.add(trace_id)
+                    group['trace_ids'].append(trace_id)
         
         return aggregated
 
     def _format_aggregated_detection(self, group_data: Dict[str, Any], summary_only: bool = False) -> str:
         """Format an aggregated detection group in Markdown"""
-        lines = []
+        buf = io.StringIO()
+        w = buf.write
         detector = group_data.get('detector', 'unknown').replace('_', ' ').title()
-        lines.append(f"**Issue**: {group_data['count']} traces flagged by {detector}")
-        lines.append("")
+        w(f"**Issue**: {group_data['count']} traces flagged by {detector}\n")
+        w("\n")
         # Suggested fix (optional, can be improved per detector)
         if detector.lower() == 'overkillmodeldetector':
-            lines.append(f"**Suggested Fix**: Route short prompts to `{group_data['suggested_model']}`")
+            w(f"**Suggested Fix**: Route short prompts to `{group_data['suggested_model']}`\n")
         elif detector.lower() == 'retryloopdetector':
-            lines.append("**Suggested Fix**: Implement exponential backoff and circuit breakers")
+            w("**Suggested Fix**: Implement exponential backoff and circuit breakers\n")
         elif detector.lower() == 'fallbackstormdetector':
-            lines.append("**Suggested Fix**: Optimize model selection logic")
+            w("**Suggested Fix**: Optimize model selection logic\n")
         elif detector.lower() == 'fallbackfailuredetector':
-            lines.append("**Suggested Fix**: Remove redundant fallback calls after successful cheaper model calls")
-        return "\n".join(lines)
+            w("**Suggested Fix**: Remove redundant fallback calls after successful cheaper model calls\n")
+        # Drop the final newline, matching "\n".join of the lines
+        return buf.getvalue()[:-1]
 
     def _format_detection(self, detection: Dict[str, Any], index: int, summary_only: bool = False) -> str:
         """Format a single detection in Markdown (kept for backward compatibility)"""
@@ -237,7 +245,10 @@ class MarkdownFormatter:
                 
                 # Fallback to calculating from pricing config
                 if model_pricing:
-                    model = record.get('model', record.get('input', {}).get('model', 'gpt-3.5-turbo'))
+                    if 'model' in record:
+                        model = record['model']
+                    else:
+                        model = (record.get('input') or {}).get('model', 'gpt-3.5-turbo')
                     
                     # Get tokens from various possible locations
                     usage = record.get('usage', {})
@@ -265,7 +276,8 @@ class MarkdownFormatter:
             trace_cost = 0.0
             for record in records:
                 cost = record.get('cost') or 0.0
-                model = record.get('input', {}).get('model', record.get('model', 'unknown'))
+                input_ = record.get('input')
+                model = input_.get('model', record.get('model', 'unknown')) if input_ else record.get('model', 'unknown')
                 
                 trace_cost += cost
                 model_costs[model] += cost
@@ -10,7 +10,11 @@ Compact, scannable forma         # Compact header with key metrics
         output.append(f"📊 CrashL            output.append(f"💡 Top {len(trace_lines)} Expensive Traces: " + " | ".join(trace_lines))ns Report – {timestamp} | Traces: {len(traces)} | Spend: {spend_str} | Savings: {savings_str}")er optimized for FinOps/AI infrastructure teams
 """
 
-from typing import Dict, List, Any, Optional
+import heapq
+import io
+from collections import defaultdict
+from operator import itemgetter
+from typing import Dict, List, Any, Optional, Tuple, Callable, Set
 from datetime import datetime
 from ..utils.pii_scrubber import PIIScrubber
 
@@ -39,7 +43,8 @@ class SlackFormatter:
         
         self.pii_scrubber = PIIScrubber()
         
-        self.pii_scrubber = PIIScrubber()
+        # Free-text detection fields that may reach the report
+        self.scrubbed_fields = ('sample_prompt', 'primary_prompt')
     
     def format(self, detections: List[Dict[str, Any]], traces: Dict[str, List[Dict[str, Any]]], model_pricing: Optional[Dict[str, Any]] = None, summary_only: bool = False, include_json_footer: bool = False) -> str:
         """Format detections in FinOps-focused compact format"""
@@ -47,8 +52,13 @@ class SlackFormatter:
             return "🔒 CrashLens runs 100% locally. No data leaves your system.\n\n✅ *No token waste patterns detected!* Your GPT usage looks efficient. 🎉"
         
         # Calculate costs and metrics
-        total_ai_spend = self._calculate_total_ai_spend(traces, model_pricing)
-        total_savings = sum(d.get('waste_cost', 0) for d in detections)
+        total_ai_spend, model_costs, trace_costs = self._compute_trace_stats(traces, model_pricing)
+        # Summary-only mode never shows prompts, so there is nothing to scrub
+        if summary_only:
+            scrubbed_detections = detections
+        else:
+            scrubbed_detections = [self.pii_scrubber.scrub_detection(detection, fields=self.scrubbed_fields) for detection in detections]
+        aggregated, total_savings, total_waste_tokens = self._aggregate_detections(scrubbed_detections)
         total_savings = min(total_savings, total_ai_spend)  # Sanity check
         
         # Generate timestamp and header
@@ -56,30 +66,28 @@ class SlackFormatter:
         spend_str = f"${total_ai_spend:.4f}" if total_ai_spend < 0.01 else f"${total_ai_spend:.2f}"
         savings_str = f"${total_savings:.4f}" if total_savings < 0.01 else f"${total_savings:.2f}"
         
-        output = []
+        buf = io.StringIO()
+        w = buf.write
         if summary_only:
-            output.append("🔒 CrashLens runs 100% locally. No data leaves your system.")
-            output.append("📝 *Summary-only mode:* Prompts, sample inputs, and trace IDs are suppressed for safe internal sharing.")
-            output.append("")
+            w("🔒 CrashLens runs 100% locally. No data leaves your system.\n")
+            w("📝 *Summary-only mode:* Prompts, sample inputs, and trace IDs are suppressed for safe internal sharing.\n")
+            w("\n")
         
         # Enhanced header with Slack-native formatting
-        output.append(f"🚨 *CrashLens Token Waste Report* 🚨")
-        output.append(f"📊 *Analysis Date:* {timestamp}")
-        output.append("")
+        w(f"🚨 *CrashLens Token Waste Report* 🚨\n")
+        w(f"📊 *Analysis Date:* {timestamp}\n")
+        w("\n")
         
         # Summary section with bullet points
-        total_waste_tokens = sum(d.get('waste_tokens', 0) for d in detections)
-        output.append("📋 *Report Summary:*")
-        output.append(f"• 💰 *Total AI Spend:* {spend_str}")
-        output.append(f"• 🔥 *Potential Savings:* {savings_str}")
-        output.append(f"• 🎯 *Wasted Tokens:* {total_waste_tokens:,}")
-        output.append(f"• ⚠️ *Issues Found:* {len(detections)}")
-        output.append(f"• 📈 *Traces Analyzed:* {len(traces)}")
-        output.append("")
+        w("📋 *Report Summary:*\n")
+        w(f"• 💰 *Total AI Spend:* {spend_str}\n")
+        w(f"• 🔥 *Potential Savings:* {savings_str}\n")
+        w(f"• 🎯 *Wasted Tokens:* {total_waste_tokens:,}\n")
+        w(f"• ⚠️ *Issues Found:* {len(detections)}\n")
+        w(f"• 📈 *Traces Analyzed:* {len(traces)}\n")
+        w("\n")
         
         # Detector summaries - sorted by waste amount
-        scrubbed_detections = [self.pii_scrubber.scrub_detection(detection) for detection in detections]
-        aggregated = self._aggregate_detections(scrubbed_detections)
         sorted_detectors = sorted(aggregated.items(), key=lambda x: x[1]['total_waste_cost'], reverse=True)
         
         for det_type, group_data in sorted_detectors:
@@ -97,12 +105,12 @@ class SlackFormatter:
             # More specific fix suggestions
             fix_hint = self._get_specific_fix_suggestion(group_data)
             
-            output.append(f"{emoji} *{detector_name}* • {group_data['count']} traces • {waste_str} wasted")
-            output.append(f"   💡 *Fix:* {fix_hint}")
+            w(f"{emoji} *{detector_name}* • {group_data['count']} traces • {waste_str} wasted\n")
+            w(f"   💡 *Fix:* {fix_hint}\n")
             
             # Add essential debugging details
             if group_data['total_waste_tokens'] > 0:
-                output.append(f"   🎯 *Wasted tokens:* {group_data['total_waste_tokens']:,}")
+                w(f"   🎯 *Wasted tokens:* {group_data['total_waste_tokens']:,}\n")
             
             # Show affected trace IDs (critical for debugging)
             if not summary_only:
@@ -112,83 +120,75 @@ class SlackFormatter:
                     trace_list = ', '.join(trace_ids[:5])  # Show up to 5 trace IDs
                     if len(trace_ids) > 5:
                         trace_list += f", +{len(trace_ids) - 5} more"
-                    output.append(f"   🔗 *Traces ({trace_count}):* `{trace_list}`")
+                    w(f"   🔗 *Traces ({trace_count}):* `{trace_list}`\n")
             
-            output.append("")  # Add spacing between detector groups
+            w("\n")  # Add spacing between detector groups
         
-        output.append("")
+        w("\n")
         
         # Top expensive traces
-        self._add_top_traces(output, traces, summary_only)
+        self._add_top_traces(w, traces, trace_costs, summary_only)
         
         # Model breakdown - single line format
-        self._add_model_breakdown(output, traces)
+        self._add_model_breakdown(w, model_costs)
         
         # Add call to action
-        output.append("💡 *Next Steps:*")
-        output.append("• Run `crashlens --detailed` for grouped JSON reports")
-        output.append("• Review trace patterns to optimize model routing")
-        output.append("• Implement suggested fixes to reduce token waste")
-        output.append("")
+        w("💡 *Next Steps:*\n")
+        w("• Run `crashlens --detailed` for grouped JSON reports\n")
+        w("• Review trace patterns to optimize model routing\n")
+        w("• Implement suggested fixes to reduce token waste\n")
+        w("\n")
         
         # Optional JSON footer for machine-readable data
         if include_json_footer:
-            self._add_json_footer(output, detections, traces, total_ai_spend, total_savings)
+            self._add_json_footer(w, detections, traces, total_ai_spend, total_savings)
         
-        return "\n".join(output)
+        # Lines are newline-terminated; drop the last one to keep the report's "\n".join shape
+        return buf.getvalue()[:-1]
     
-    def _add_top_traces(self, output: List[str], traces: Dict[str, List[Dict[str, Any]]], summary_only: bool):
+    def _add_top_traces(self, w: Callable[[str], Any], traces: Dict[str, List[Dict[str, Any]]], trace_costs: Dict[str, float], summary_only: bool):
         """Add top expensive traces section with Slack-native formatting"""
-        trace_costs = {}
-        
-        for trace_id, records in traces.items():
-            trace_cost = sum((record.get('cost') or 0.0) for record in records)
-            if trace_cost > 0:
-                trace_costs[trace_id] = trace_cost
-        
         if trace_costs:
-            sorted_traces = sorted(trace_costs.items(), key=lambda x: x[1], reverse=True)[:self.max_traces_to_show]
+            top_traces = heapq.nlargest(self.max_traces_to_show, trace_costs.items(), key=itemgetter(1))
             
-            output.append("🏆 *Top Expensive Traces:*")
-            for i, (trace_id, cost) in enumerate(sorted_traces, 1):
+            w("🏆 *Top Expensive Traces:*\n")
+            for i, (trace_id, cost) in enumerate(top_traces, 1):
                 cost_str = f"${cost:.4f}" if cost < 0.01 else f"${cost:.2f}"
                 if summary_only:
-                    output.append(f"• #{i} → `trace_***` → {cost_str}")
+                    w(f"• #{i} → `trace_***` → {cost_str}\n")
                 else:
                     # Get model from first record
                     first_record = traces[trace_id][0] if traces[trace_id] else {}
                     model = first_record.get('input', {}).get('model', first_record.get('model', 'unknown'))
-                    output.append(f"• #{i} → `{trace_id}` → {model} → {cost_str}")
-            output.append("")
+                    w(f"• #{i} → `{trace_id}` → {model} → {cost_str}\n")
+            w("\n")
     
-    def _add_model_breakdown(self, output: List[str], traces: Dict[str, List[Dict[str, Any]]]):
+    def _add_model_breakdown(self, w: Callable[[str], Any], model_costs: Dict[str, float]):
         """Add model cost breakdown with Slack-native formatting"""
-        from collections import defaultdict
-        
-        model_costs = defaultdict(float)
-        
-        for records in traces.values():
-            for record in records:
-                cost = record.get('cost') or 0.0
-                model = record.get('input', {}).get('model', record.get('model', 'unknown'))
-                model_costs[model] += cost
-        
         if model_costs:
             total_cost = sum(model_costs.values())
-            sorted_models = sorted(model_costs.items(), key=lambda x: x[1], reverse=True)
+            sorted_models = sorted(model_costs.items(), key=itemgetter(1), reverse=True)
             
-            output.append("🤖 *Cost by Model:*")
+            w("🤖 *Cost by Model:*\n")
             for model, cost in sorted_models:
                 cost_str = f"${cost:.4f}" if cost < 0.01 else f"${cost:.2f}"
                 percentage = (cost / total_cost * 100) if total_cost > 0 else 0
-                output.append(f"• {model} → {cost_str} ({percentage:.0f}%)")
-            output.append("")
+                w(f"• {model} → {cost_str} ({percentage:.0f}%)\n")
+            w("\n")
 
-    def _aggregate_detections(self, detections: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
-        """Aggregate detections by detector type"""
+    def _aggregate_detections(self, detections: List[Dict[str, Any]]) -> Tuple[Dict[str, Dict[str, Any]], float, int]:
+        """Aggregate detections by detector type, tallying overall waste cost and tokens in the same pass"""
         aggregated = {}
+        seen_trace_ids: Dict[str, Set[str]] = {}
+        total_waste_cost = 0.0
+        total_waste_tokens = 0
         
         for detection in detections:
+            waste_cost = detection.get('waste_cost', 0)
+            waste_tokens = detection.get('waste_tokens', 0)
+            total_waste_cost += waste_cost
+            total_waste_tokens += waste_tokens
+            
             # Get the proper detector name from the detection
             detector = detection.get('type', 'unknown')  # Use 'type' field instead of 'detector'
             if detector == 'unknown':
@@ -205,8 +205,10 @@ class SlackFormatter:
             elif detector == 'fallback_failure':
                 detector = 'fallback_failure'
             
-            if detector not in aggregated:
-                aggregated[detector] = {
+            group = aggregated.get(detector)
+            if group is None:
+                seen_trace_ids[detector] = set()
+                group = aggregated[detector] = {
                     'detector': detector,
                     'count': 0,
                     'total_waste_cost': 0.0,
@@ -215,18 +217,20 @@ class SlackFormatter:
                     'detections': []
                 }
             
-            group = aggregated[detector]
             group['count'] += 1
-            group['total_waste_cost'] += detection.get('waste_cost', 0)
-            group['total_waste_tokens'] += detection.get('waste_tokens', 0)
+            group['total_waste_cost'] += waste_cost
+            group['total_waste_tokens'] += waste_tokens
             group['detections'].append(detection)
             
-            # Add trace ID to the list
+            # Add trace ID to the list, deduplicated through a per-group set
             trace_id = detection.get('trace_id')
-            if trace_id and trace_id not in group['trace_ids']:
-                group['trace_ids'].append(trace_id)
+            if trace_id:
+                seen = seen_trace_ids[detector]
+                if trace_id not in seen:
+                    seen.add(trace_id)
+                    group['trace_ids'].append(trace_id)
         
-        return aggregated
+        return aggregated, total_waste_cost, total_waste_tokens
 
     def _get_specific_fix_suggestion(self, group_data: Dict[str, Any]) -> str:
         """Generate specific, actionable fix suggestions based on detection data"""
@@ -266,7 +270,7 @@ class SlackFormatter:
         else:
             return self.detector_fixes.get(detector, 'optimize usage')
 
-    def _add_json_footer(self, output: List[str], detections: List[Dict[str, Any]], traces: Dict[str, List[Dict[str, Any]]], total_spend: float, total_savings: float):
+    def _add_json_footer(self, w: Callable[[str], Any], detections: List[Dict[str, Any]], traces: Dict[str, List[Dict[str, Any]]], total_spend: float, total_savings: float):
         """Add machine-readable JSON footer for automation"""
         import json
         
@@ -275,12 +279,9 @@ class SlackFormatter:
         detection_count = len(detections)
         
         # Group detections by type
-        detections_by_type = {}
+        detections_by_type = defaultdict(list)
         for detection in detections:
-            det_type = detection.get('type', 'unknown')
-            if det_type not in detections_by_type:
-                detections_by_type[det_type] = []
-            detections_by_type[det_type].append(detection)
+            detections_by_type[detection.get('type', 'unknown')].append(detection)
         
         # Create machine-readable summary
         json_summary = {
@@ -300,35 +301,64 @@ class SlackFormatter:
             }
         }
         
-        output.append("")
-        output.append("```json")
-        output.append(json.dumps(json_summary, indent=2))
-        output.append("```")
+        w("\n")
+        w("```json\n")
+        w(json.dumps(json_summary, indent=2) + "\n")
+        w("```\n")
     
-    def _calculate_total_ai_spend(self, traces: Dict[str, List[Dict[str, Any]]], model_pricing: Optional[Dict[str, Any]] = None) -> float:
-        """Calculate the total cost of all traces using existing cost field or pricing config"""
+    def _compute_trace_stats(self, traces: Dict[str, List[Dict[str, Any]]], model_pricing: Optional[Dict[str, Any]] = None) -> Tuple[float, Dict[str, float], Dict[str, float]]:
+        """
+        Walk all trace records once and return (total_spend, model_costs, trace_costs)
+        
+        Total spend uses the record cost field, falling back to the pricing config.
+        Model and trace breakdowns only count recorded costs; traces without cost are omitted.
+        """
         total = 0.0
-        for records in traces.values():
+        model_costs: Dict[str, float] = defaultdict(float)
+        trace_costs: Dict[str, float] = {}
+        rates: Dict[str, Tuple[float, float]] = {}  # Per-model pricing, resolved once per model
+        
+        for trace_id, records in traces.items():
+            trace_cost = 0.0
             for record in records:
-                # First try to use existing cost field
-                if 'cost' in record and record['cost'] is not None:
-                    total += record['cost']
-                    continue
+                cost = record.get('cost')
+                input_ = record.get('input')
+                model = input_.get('model', record.get('model', 'unknown')) if input_ else record.get('model', 'unknown')
+                model_costs[model] += cost or 0.0
+                trace_cost += cost or 0.0
                 
-                # Fallback to calculating from pricing config
-                if model_pricing:
-                    model = record.get('model', record.get('input', {}).get('model', 'gpt-3.5-turbo'))
-                    
-                    # Get tokens from various possible locations
-                    usage = record.get('usage', {})
-                    input_tokens = (record.get('prompt_tokens') or 
-                                   usage.get('prompt_tokens') or 0)
-                    output_tokens = (record.get('completion_tokens') or 
-                                    usage.get('completion_tokens') or 0)
-                    
-                    model_config = model_pricing.get(model, {})
-                    if model_config:
-                        input_cost = (input_tokens / 1000) * model_config.get('input_cost_per_1k', 0)
-                        output_cost = (output_tokens / 1000) * model_config.get('output_cost_per_1k', 0)
-                        total += input_cost + output_cost
-        return total 
\ No newline at end of file
+                # First try to use existing cost field
+                if cost is not None:
+                    total += cost
+                elif model_pricing:
+                    # Fallback to calculating from pricing config
+                    total += self._calculate_record_cost(record, model_pricing, rates)
+            
+            if trace_cost > 0:
+                trace_costs[trace_id] = trace_cost
+        
+        return total, model_costs, trace_costs
+    
+    def _calculate_record_cost(self, record: Dict[str, Any], model_pricing: Dict[str, Any], rates: Dict[str, Tuple[float, float]]) -> float:
+        """Calculate the cost of a record without a cost field from the pricing config"""
+        if 'model' in record:
+            model = record['model']
+        else:
+            model = (record.get('input') or {}).get('model', 'gpt-3.5-turbo')
+        
+        rate = rates.get(model)
+        if rate is None:
+            model_config = model_pricing.get(model) or {}
+            rate = rates[model] = (model_config.get('input_cost_per_1k', 0), model_config.get('output_cost_per_1k', 0))
+        input_rate, output_rate = rate
+        if not (input_rate or output_rate):
+            return 0.0
+        
+        # Get tokens from various possible locations
+        usage = record.get('usage') or {}
+        input_tokens = (record.get('prompt_tokens') or 
+                       usage.get('prompt_tokens') or 0)
+        output_tokens = (record.get('completion_tokens') or 
+                        usage.get('completion_tokens') or 0)
+        
+        return (input_tokens / 1000) * input_rate + (output_tokens / 1000) * output_rate
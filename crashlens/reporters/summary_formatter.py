@@ -9,6 +9,30 @@ from ..utils.pii_scrubber import PIIScrubber
 from collections import defaultdict
 
 
+class WasteTally:
+    """Running waste tallies, fed one active detection at a time"""
+    
+    def __init__(self):
+        self.issue_count = 0
+        self.total_waste_cost = 0.0
+        self.total_waste_tokens = 0
+        # {type: {'count', 'total_cost', 'total_tokens'}} in first-seen order
+        self.waste_by_type: Dict[str, Dict[str, Any]] = defaultdict(lambda: {'count': 0, 'total_cost': 0.0, 'total_tokens': 0})
+    
+    def feed(self, detection: Dict[str, Any]):
+        """Add a single active detection to the running tallies"""
+        waste_cost = detection.get('waste_cost', 0)
+        waste_tokens = detection.get('waste_tokens', 0)
+        self.issue_count += 1
+        self.total_waste_cost += waste_cost
+        self.total_waste_tokens += waste_tokens
+        
+        data = self.waste_by_type[detection.get('type', 'unknown')]
+        data['count'] += 1
+        data['total_cost'] += waste_cost
+        data['total_tokens'] += waste_tokens
+
+
 class SummaryFormatter:
     """Formats cost summaries by route, model, and team"""
     
@@ -17,12 +41,19 @@ class SummaryFormatter:
     
     def format(self, traces: Dict[str, List[Dict[str, Any]]], model_pricing: Dict[str, Any], summary_only: bool = False, detections: Optional[List[Dict[str, Any]]] = None) -> str:
         """Format cost summary from traces using compact FinOps format with waste analysis"""
+        tally = WasteTally()
+        for detection in detections or ():
+            tally.feed(detection)
+        return self.format_tally(traces, model_pricing, tally, summary_only)
+    
+    def format_tally(self, traces: Dict[str, List[Dict[str, Any]]], model_pricing: Dict[str, Any], tally: WasteTally, summary_only: bool = False) -> str:
+        """Format cost summary from traces, with waste analysis from tallies already fed"""
         if not traces:
             return "🔒 CrashLens runs 100% locally. No data leaves your system.\nℹ️  No traces found for summary"
         
         # For summary-only mode, create ultra-concise 2-3 line report
         if summary_only:
-            return self._format_summary_only(traces, model_pricing, detections)
+            return self._format_summary_only(traces, model_pricing, tally)
         
         # Regular summary mode - detailed format
         output = []
@@ -81,17 +112,17 @@ class SummaryFormatter:
         self._add_top_traces_summary(output, traces, summary_only)
         
         # Add waste analysis if detections are provided
-        if detections:
-            self._add_waste_analysis_summary(output, detections, summary_only)
+        if tally.issue_count:
+            self._add_waste_analysis_summary(output, tally, summary_only)
         
         return "\n".join(output)
 
-    def _format_summary_only(self, traces: Dict[str, List[Dict[str, Any]]], model_pricing: Dict[str, Any], detections: Optional[List[Dict[str, Any]]] = None) -> str:
+    def _format_summary_only(self, traces: Dict[str, List[Dict[str, Any]]], model_pricing: Dict[str, Any], tally: WasteTally) -> str:
         """Create ultra-concise 2-3 line summary-only report"""
         # Calculate totals
         total_cost = 0.0
-        total_waste_cost = 0.0
-        total_issues = 0
+        total_waste_cost = tally.total_waste_cost
+        total_issues = tally.issue_count
         
         # Calculate total cost
         for trace_id, records in traces.items():
@@ -99,11 +130,6 @@ class SummaryFormatter:
                 cost = self._calculate_record_cost(record, model_pricing)
                 total_cost += cost
         
-        # Calculate waste cost and issues
-        if detections:
-            total_waste_cost = sum(d.get('waste_cost', 0) for d in detections)
-            total_issues = len(detections)
-        
         # Format costs
         cost_str = f"${total_cost:.2f}" if total_cost >= 0.01 else f"${total_cost:.4f}"
         waste_str = f"${total_waste_cost:.2f}" if total_waste_cost >= 0.01 else f"${total_waste_cost:.4f}"
@@ -115,18 +141,11 @@ class SummaryFormatter:
         output.append(f"📊 {len(traces)} traces | {cost_str} total | {waste_str} waste")
         
         # Line 2: Issues breakdown (only if there are issues)
-        if total_issues > 0 and detections:
-            # Group by type for concise display
-            issue_types = {}
-            for detection in detections:
-                detector_type = detection.get('type', 'unknown')
-                if detector_type not in issue_types:
-                    issue_types[detector_type] = 0
-                issue_types[detector_type] += 1
-            
-            # Create compact issue summary
+        if total_issues > 0:
+            # Create compact issue summary, grouped by type
             issue_parts = []
-            for issue_type, count in issue_types.items():
+            for issue_type, data in tally.waste_by_type.items():
+                count = data['count']
                 if issue_type == 'retry_loop':
                     issue_parts.append(f"{count} retry")
                 elif issue_type == 'fallback_storm':
@@ -204,25 +223,12 @@ class SummaryFormatter:
         
         return 0.0
 
-    def _add_waste_analysis_summary(self, output: List[str], detections: Optional[List[Dict[str, Any]]], summary_only: bool):
+    def _add_waste_analysis_summary(self, output: List[str], tally: WasteTally, summary_only: bool):
         """Add concise waste analysis to summary in tabular format"""
-        if not detections:
+        if not tally.issue_count:
             return
         
-        # Group detections by type
-        waste_by_type = {}
-        for detection in detections:
-            detector_type = detection.get('type', 'unknown')
-            if detector_type not in waste_by_type:
-                waste_by_type[detector_type] = {
-                    'count': 0,
-                    'total_cost': 0.0,
-                    'total_tokens': 0
-                }
-            
-            waste_by_type[detector_type]['count'] += 1
-            waste_by_type[detector_type]['total_cost'] += detection.get('waste_cost', 0)
-            waste_by_type[detector_type]['total_tokens'] += detection.get('waste_tokens', 0)
+        waste_by_type = tally.waste_by_type
         
         # Map detector types to display names
         display_names = {
@@ -232,8 +238,8 @@ class SummaryFormatter:
             'overkill_model': '❓ Overkill Models'
         }
         
-        total_waste_cost = sum(d.get('waste_cost', 0) for d in detections)
-        total_waste_tokens = sum(d.get('waste_tokens', 0) for d in detections)
+        total_waste_cost = tally.total_waste_cost
+        total_waste_tokens = tally.total_waste_tokens
         
         if total_waste_cost > 0:
             output.append("")
@@ -261,9 +267,9 @@ class SummaryFormatter:
             # Add total row
             total_cost_str = f"${total_waste_cost:.4f}"
             if summary_only:
-                output.append(f"| **Total** | **{len(detections)}** | **{total_cost_str}** |")
+                output.append(f"| **Total** | **{tally.issue_count}** | **{total_cost_str}** |")
             else:
-                output.append(f"| **Total** | **{len(detections)}** | **{total_cost_str}** | **{total_waste_tokens:,}** |")
+                output.append(f"| **Total** | **{tally.issue_count}** | **{total_cost_str}** | **{total_waste_tokens:,}** |")
         else:
             output.append("")
             output.append("✅ No waste patterns detected") 
\ No newline at end of file
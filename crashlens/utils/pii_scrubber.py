@@ -4,7 +4,7 @@ Masks or removes personally identifiable information from logs and outputs
 """
 
 import re
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterable, Optional
 
 
 class PIIScrubber:
@@ -39,6 +39,14 @@ class PIIScrubber:
             # UUIDs (might contain sensitive info)
             (r'\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b', '[UUID]'),
         ]
+        
+        # Combine all mask patterns into one compiled alternation so text is scanned once;
+        # earlier patterns win when several match at the same position
+        self._mask_regex = re.compile(
+            '|'.join(f'(?P<mask{i}>{pattern})' for i, (pattern, _) in enumerate(self.mask_patterns)),
+            re.IGNORECASE
+        )
+        self._mask_replacements = {f'mask{i}': replacement for i, (_, replacement) in enumerate(self.mask_patterns)}
     
     def scrub_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
         """Scrub PII from a single log record"""
@@ -89,18 +97,26 @@ class PIIScrubber:
         if not isinstance(text, str):
             return text
         
-        scrubbed = text
-        
-        # Apply mask patterns
-        for pattern, replacement in self.mask_patterns:
-            scrubbed = re.sub(pattern, replacement, scrubbed, flags=re.IGNORECASE)
-        
-        return scrubbed
+        return self._mask_regex.sub(self._mask_replacement, text)
     
-    def scrub_detection(self, detection: Dict[str, Any]) -> Dict[str, Any]:
-        """Scrub PII from detection output"""
+    def _mask_replacement(self, match: 're.Match[str]') -> str:
+        """Return the mask for whichever pattern produced the match"""
+        return self._mask_replacements[match.lastgroup]
+    
+    def scrub_detection(self, detection: Dict[str, Any], fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Scrub PII from detection output
+        
+        If fields is given, only those text fields are scrubbed and nested records are left untouched.
+        """
         scrubbed = detection.copy()
         
+        if fields is not None:
+            for field in fields:
+                if field in scrubbed:
+                    scrubbed[field] = self.scrub_text(scrubbed[field])
+            return scrubbed
+        
         # Scrub sample prompt
         if 'sample_prompt' in scrubbed:
             scrubbed['sample_prompt'] = self.scrub_text(scrubbed['sample_prompt'])
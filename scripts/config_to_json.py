@@ -0,0 +1,30 @@
+"""
+Regenerate the bundled JSON config copies from their YAML sources
+
+The YAML files in crashlens/config/ are the ones to edit; CrashLens loads the
+JSON copies next to them because they parse much faster. Run after editing:
+
+    python scripts/config_to_json.py
+"""
+
+import json
+from pathlib import Path
+
+import yaml
+
+CONFIG_DIR = Path(__file__).resolve().parent.parent / "crashlens" / "config"
+SOURCES = ("pricing.yaml", "crashlens-policy.yaml")
+
+
+def convert(yaml_path: Path) -> Path:
+    """Write yaml_path's content as JSON next to it, returning the JSON path"""
+    with open(yaml_path, encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+    json_path = yaml_path.with_suffix(".json")
+    json_path.write_text(json.dumps(config, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    return json_path
+
+
+if __name__ == "__main__":
+    for name in SOURCES:
+        print(f"✅ Wrote {convert(CONFIG_DIR / name)}")
@@ -0,0 +1,65 @@
+"""
+Tests for config loading
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import yaml
+
+from crashlens.cli import CONFIG_DIR, _bundled_config_path, load_pricing_config
+
+
+class TestBundledConfig(unittest.TestCase):
+    """Test the JSON copies shipped next to the YAML config sources"""
+
+    def test_json_matches_yaml(self):
+        """Test each bundled JSON file is an up-to-date conversion of its YAML source"""
+        for yaml_name in ("pricing.yaml", "crashlens-policy.yaml"):
+            yaml_path = CONFIG_DIR / yaml_name
+            with self.subTest(yaml_name):
+                with open(yaml_path, encoding="utf-8") as f:
+                    source = yaml.safe_load(f)
+                with open(yaml_path.with_suffix('.json'), encoding="utf-8") as f:
+                    self.assertEqual(json.load(f), source,
+                                     f"{yaml_path.with_suffix('.json').name} is stale - run: python scripts/config_to_json.py")
+
+    def test_bundled_config_path(self):
+        """Test the JSON copy is preferred unless it is missing or older than an edited YAML"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_dir = Path(tmpdir)
+            yaml_path = config_dir / "pricing.yaml"
+            json_path = config_dir / "pricing.json"
+            yaml_path.write_text("models: {}\n", encoding="utf-8")
+
+            self.assertEqual(_bundled_config_path("pricing.yaml", config_dir), yaml_path)
+
+            json_path.write_text('{"models": {}}\n', encoding="utf-8")
+            os.utime(yaml_path, (1000, 1000))
+            os.utime(json_path, (1000, 1000))
+            self.assertEqual(_bundled_config_path("pricing.yaml", config_dir), json_path)
+
+            # YAML written just after its JSON copy, as a checkout does
+            os.utime(yaml_path, (1001, 1001))
+            self.assertEqual(_bundled_config_path("pricing.yaml", config_dir), json_path)
+
+            # YAML edited without regenerating the JSON copy
+            os.utime(yaml_path, (2000, 2000))
+            self.assertEqual(_bundled_config_path("pricing.yaml", config_dir), yaml_path)
+
+    def test_user_yaml_config(self):
+        """Test a user-supplied --config is still read as YAML"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "custom-pricing.yaml"
+            path.write_text("models:\n  gpt-4:\n    input_cost_per_1m: 1.0\n", encoding="utf-8")
+
+            config = load_pricing_config(path)
+
+        self.assertEqual(config, {"models": {"gpt-4": {"input_cost_per_1m": 1.0}}})
+
+
+if __name__ == '__main__':
+    unittest.main()
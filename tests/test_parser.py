@@ -0,0 +1,83 @@
+"""
+Tests for the Langfuse JSONL parser
+"""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from crashlens.parsers.langfuse import LangfuseParser, HAS_MULTIPLE_CALLS, HAS_MODEL_SWITCH
+
+
+def _record(trace_id, prompt, model="gpt-4"):
+    return {
+        "traceId": trace_id,
+        "startTime": "2024-01-15T10:00:00Z",
+        "input": {"model": model, "prompt": prompt},
+        "usage": {"prompt_tokens": 5, "completion_tokens": 5},
+        "cost": 0.0003
+    }
+
+
+class TestLangfuseParser(unittest.TestCase):
+    """Test chunked file parsing"""
+
+    def setUp(self):
+        self.parser = LangfuseParser()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def _write(self, lines):
+        path = Path(self.tmpdir.name) / "logs.jsonl"
+        path.write_text("\n".join(lines), encoding="utf-8")
+        return path
+
+    def test_lines_spanning_chunks(self):
+        """Test records split across tiny read chunks are reassembled"""
+        lines = [json.dumps(_record(f"trace_{i % 3}", "é" * i)) for i in range(20)]
+        path = self._write(lines)
+
+        traces = self.parser.parse_file(path, chunk_size=7)
+
+        self.assertEqual(sorted(traces), ["trace_0", "trace_1", "trace_2"])
+        self.assertEqual(sum(len(records) for records in traces.values()), 20)
+        self.assertEqual(traces["trace_1"][1]["prompt"], "é" * 4)
+
+    def test_matches_string_parsing(self):
+        """Test file and string parsing group records identically"""
+        lines = [json.dumps(_record("trace_a", "hello")), "", "not json", json.dumps(_record("trace_b", "hi"))]
+        path = self._write(lines)
+
+        from_file = self.parser.parse_file(path, chunk_size=16)
+        from_file = {k: list(v) for k, v in from_file.items()}
+        from_string = self.parser.parse_string("\n".join(lines))
+
+        self.assertEqual(from_file, from_string)
+
+    def test_feature_masks(self):
+        """Test per-trace feature bits are derived while parsing"""
+        lines = [
+            json.dumps(_record("single", "hi")),
+            json.dumps(_record("repeat", "hi")),
+            json.dumps(_record("repeat", "hi")),
+            json.dumps(_record("switch", "hi")),
+            json.dumps(_record("switch", "hi", model="gpt-3.5-turbo")),
+        ]
+
+        self.parser.parse_string("\n".join(lines))
+
+        self.assertEqual(self.parser.feature_masks, {
+            "single": 0,
+            "repeat": HAS_MULTIPLE_CALLS,
+            "switch": HAS_MULTIPLE_CALLS | HAS_MODEL_SWITCH,
+        })
+        self.assertEqual(self.parser.parse_stats, {
+            "total_events": 5,
+            "max_events_per_trace": 2,
+            "features_seen": HAS_MULTIPLE_CALLS | HAS_MODEL_SWITCH,
+        })
+
+
+if __name__ == '__main__':
+    unittest.main()
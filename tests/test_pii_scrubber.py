@@ -0,0 +1,48 @@
+"""
+Tests for PII scrubbing
+"""
+
+import unittest
+
+from crashlens.utils.pii_scrubber import PIIScrubber
+
+
+class TestScrubText(unittest.TestCase):
+    """Test text masking with the combined pattern"""
+
+    def setUp(self):
+        self.scrubber = PIIScrubber()
+
+    def test_each_mask(self):
+        """Test every pattern is replaced by its own mask"""
+        cases = [
+            ("mail jane.doe@example.com now", "mail [EMAIL] now"),
+            ("call 555-123-4567 now", "call [PHONE] now"),
+            ("pay 4111 1111 1111 1111 now", "pay [CARD] now"),
+            ("ssn 123-45-6789 now", "ssn [SSN] now"),
+            ("from 192.168.0.1 now", "from [IP] now"),
+            ("key sk-abcdefghijklmnopqrstuvwx now", "key [API_KEY] now"),
+            ("id 123E4567-E89B-12D3-A456-426614174000 now", "id [UUID] now"),
+        ]
+        for text, expected in cases:
+            with self.subTest(text):
+                self.assertEqual(self.scrubber.scrub_text(text), expected)
+
+    def test_adjacent_and_overlapping_matches(self):
+        """Test one left-to-right scan: adjacent matches are masked separately, and at a
+        shared start position the earlier pattern wins"""
+        self.assertEqual(
+            self.scrubber.scrub_text("jane@example.com 4111-1111-1111-1111"),
+            "[EMAIL] [CARD]"
+        )
+        # The card number is also the email's local part; email is listed first
+        self.assertEqual(self.scrubber.scrub_text("4111-1111-1111-1111@bank.com"), "[EMAIL]")
+
+    def test_non_string_passthrough(self):
+        """Test non-string values are returned unchanged"""
+        self.assertIsNone(self.scrubber.scrub_text(None))
+        self.assertEqual(self.scrubber.scrub_text(42), 42)
+
+
+if __name__ == '__main__':
+    unittest.main()
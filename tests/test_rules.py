@@ -3,11 +3,15 @@ Tests for CrashLens detection rules
 """
 
 import unittest
+from types import SimpleNamespace
 from unittest.mock import Mock, patch
 from datetime import datetime, timedelta
 
 from crashlens.detectors.retry_loops import RetryLoopDetector
 from crashlens.detectors.fallback_storm import FallbackStormDetector
+from crashlens.detectors.detection import Detection
+from crashlens.cli import SuppressionEngine, OverkillModelDetector, _run_detectors
+from crashlens.parsers.langfuse import LangfuseParser
 
 
 class TestRetryLoopDetector(unittest.TestCase):
@@ -129,5 +133,107 @@ class TestFallbackStormDetector(unittest.TestCase):
         self.assertEqual(detections[0]['fallback_count'], 3)
 
 
+class TestDetection(unittest.TestCase):
+    """Test dict-style access on detection records"""
+    
+    def test_dict_style_access(self):
+        """Test that fields and details read and write like dict keys"""
+        detection = Detection(type='retry_loop', trace_id='trace_001', waste_cost=0.5,
+                              details={'sample_prompt': 'hi'})
+        
+        self.assertEqual(detection['waste_cost'], 0.5)
+        self.assertEqual(detection.get('sample_prompt'), 'hi')
+        self.assertEqual(detection.get('model_used', 'unknown'), 'unknown')
+        self.assertNotIn('model_used', detection)
+        
+        detection['suppressed_by'] = 'RetryLoopDetector'
+        detection['model_used'] = 'gpt-4'
+        self.assertEqual(detection.suppressed_by, 'RetryLoopDetector')
+        self.assertEqual(detection.details['model_used'], 'gpt-4')
+        
+        copy = detection.copy()
+        copy['sample_prompt'] = 'changed'
+        self.assertEqual(detection['sample_prompt'], 'hi')
+        self.assertEqual(detection.to_dict()['trace_id'], 'trace_001')
+        self.assertEqual(dict(detection), detection.to_dict())
+
+
+class TestSuppressionEngine(unittest.TestCase):
+    """Test trace ownership and priority suppression"""
+    
+    def setUp(self):
+        self.engine = SuppressionEngine()
+    
+    def test_higher_priority_detector_supersedes_owner(self):
+        """Test that a higher priority detector takes over a trace"""
+        overkill = {'type': 'overkill_model', 'trace_id': 'trace_001', 'waste_cost': 0.01}
+        other = {'type': 'overkill_model', 'trace_id': 'trace_002', 'waste_cost': 0.02}
+        retry = {'type': 'retry_loop', 'trace_id': 'trace_001', 'waste_cost': 0.03}
+        
+        self.engine.process_detections('OverkillModelDetector', [overkill, other])
+        self.engine.process_detections('RetryLoopDetector', [retry])
+        
+        self.assertEqual(self.engine.active_detections, [other, retry])
+        self.assertEqual(self.engine.trace_ownership['trace_001'], 'RetryLoopDetector')
+        self.assertEqual(len(self.engine.suppressed_detections), 1)
+        self.assertEqual(
+            self.engine.suppressed_detections[0]['suppression_reason'],
+            'superseded_by:RetryLoopDetector'
+        )
+        self.assertIs(self.engine.suppressed_detections[0].base, overkill)
+        self.assertEqual(self.engine.suppressed_detections[0]['trace_id'], 'trace_001')
+        self.assertIn('trace_id', self.engine.suppressed_detections[0])
+        self.assertIn('suppression_reason', self.engine.suppressed_detections[0])
+        self.assertNotIn('sample_prompt', self.engine.suppressed_detections[0])
+        self.assertEqual(dict(self.engine.suppressed_detections[0]), {
+            **overkill,
+            'suppressed_by': 'OverkillModelDetector',
+            'suppression_reason': 'superseded_by:RetryLoopDetector',
+            'detector': 'OverkillModelDetector',
+        })
+    
+    def test_lower_priority_detector_is_suppressed(self):
+        """Test that a lower priority detector cannot claim an owned trace"""
+        retry = {'type': 'retry_loop', 'trace_id': 'trace_001'}
+        storm = {'type': 'fallback_storm', 'trace_id': 'trace_001'}
+        
+        self.engine.process_detections('RetryLoopDetector', [retry])
+        active = self.engine.process_detections('FallbackStormDetector', [storm])
+        
+        self.assertEqual(active, [])
+        summary = self.engine.get_suppression_summary()
+        self.assertEqual(summary['active_issues'], 1)
+        self.assertEqual(summary['suppression_breakdown'], {'higher_priority_detector:RetryLoopDetector': 1})
+    
+    def test_detectors_no_trace_can_trigger_are_skipped(self):
+        """Test that detectors needing more calls than any trace has are never run"""
+        parser = LangfuseParser()
+        traces = parser.parse_string('{"traceId": "trace_001", "input": {"model": "gpt-4", "prompt": "hi"}, "usage": {"completion_tokens": 1}}')
+        retry_call = Mock(return_value=[])
+        overkill_call = Mock(return_value=[])
+        detectors = [
+            ('RetryLoopDetector', RetryLoopDetector(), retry_call),
+            ('OverkillModelDetector', OverkillModelDetector(), overkill_call),
+        ]
+        
+        _run_detectors(detectors, traces, parser.feature_masks, {}, SuppressionEngine(), parser.parse_stats)
+        
+        retry_call.assert_not_called()
+        overkill_call.assert_called_once()
+    
+    def test_detector_without_required_features_is_not_run(self):
+        """Test that a detector not declaring required_features is reported, not run on every trace"""
+        parser = LangfuseParser()
+        traces = parser.parse_string('{"traceId": "trace_001", "input": {"model": "gpt-4", "prompt": "hi"}, "usage": {"completion_tokens": 1}}')
+        call = Mock(return_value=[])
+        detectors = [('CustomDetector', SimpleNamespace(min_calls=1), call)]
+        
+        with patch('click.echo') as echo:
+            _run_detectors(detectors, traces, parser.feature_masks, {}, SuppressionEngine(), parser.parse_stats)
+        
+        call.assert_not_called()
+        self.assertIn('CustomDetector failed', echo.call_args.args[0])
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,109 @@
+"""
+Tests for the summary formatter
+"""
+
+import unittest
+from unittest.mock import patch
+
+from crashlens.reporters.summary_formatter import SummaryFormatter, WasteTally
+
+
+TRACES = {
+    'trace_001': [
+        {'traceId': 'trace_001', 'input': {'model': 'gpt-4'}, 'usage': {'prompt_tokens': 100, 'completion_tokens': 50}, 'cost': 0.25},
+        {'traceId': 'trace_001', 'input': {'model': 'gpt-4'}, 'usage': {'prompt_tokens': 100, 'completion_tokens': 50}, 'cost': 0.25},
+    ],
+    'trace_002': [
+        {'traceId': 'trace_002', 'input': {'model': 'gpt-3.5-turbo'}, 'usage': {'prompt_tokens': 20, 'completion_tokens': 5}, 'cost': 0.002},
+    ],
+}
+
+DETECTIONS = [
+    {'type': 'retry_loop', 'trace_id': 'trace_001', 'waste_cost': 0.25, 'waste_tokens': 150},
+    {'type': 'overkill_model', 'trace_id': 'trace_002', 'waste_cost': 0.0015, 'waste_tokens': 25},
+    {'type': 'retry_loop', 'trace_id': 'trace_003', 'waste_cost': 0.05, 'waste_tokens': 10},
+]
+
+# Output of the formatter before detections were streamed into tallies
+EXPECTED_SUMMARY_ONLY = (
+    "📊 2 traces | $0.50 total | $0.30 waste\n"
+    "🚨 3 issues: 2 retry, 1 overkill\n"
+    "💡 60% potential savings"
+)
+
+EXPECTED_SUMMARY = (
+    "🔒 CrashLens runs 100% locally. No data leaves your system.\n"
+    "📝 Summary mode: Trace IDs are suppressed for safe internal sharing.\n"
+    "📊 CrashLens Summary – 2024-01-15 10:00:00 | Traces: 2 | Cost: $0.50 | Tokens: 325\n"
+    "\n"
+    "🤖 **Model Breakdown**\n"
+    "\n"
+    "| Model | Cost | Percentage |\n"
+    "|-------|------|------------|\n"
+    "| gpt-4 | $0.50 | 100% |\n"
+    "| gpt-3.5-turbo | $0.0020 | 0% |\n"
+    "\n"
+    "🏆 **Top Expensive Traces**\n"
+    "\n"
+    "| Rank | Model | Cost |\n"
+    "|------|-------|------|\n"
+    "| #1 | gpt-4 | $0.50 |\n"
+    "| #2 | gpt-3.5-turbo | $0.0020 |\n"
+    "\n"
+    "\n"
+    "🚨 **Waste Analysis**\n"
+    "\n"
+    "| Issue Type | Count | Cost | Tokens |\n"
+    "|------------|-------|------|--------|\n"
+    "| 🔄 Retry Loops | 2 | $0.3000 | 160 |\n"
+    "| ❓ Overkill Models | 1 | $0.0015 | 25 |\n"
+    "| **Total** | **3** | **$0.3015** | **185** |"
+)
+
+
+class TestSummaryFormatter(unittest.TestCase):
+    """Test summary output from a detection list and from fed tallies"""
+
+    def setUp(self):
+        self.formatter = SummaryFormatter()
+        patcher = patch('crashlens.reporters.summary_formatter.datetime')
+        self.addCleanup(patcher.stop)
+        patcher.start().now.return_value.strftime.return_value = '2024-01-15 10:00:00'
+
+    def _fed_tally(self):
+        tally = WasteTally()
+        for detection in DETECTIONS:
+            tally.feed(detection)
+        return tally
+
+    def test_feed_tallies(self):
+        """Test feed() keeps running totals and per-type tallies in first-seen order"""
+        tally = self._fed_tally()
+
+        self.assertEqual(tally.issue_count, 3)
+        self.assertAlmostEqual(tally.total_waste_cost, 0.3015)
+        self.assertEqual(tally.total_waste_tokens, 185)
+        self.assertEqual(list(tally.waste_by_type), ['retry_loop', 'overkill_model'])
+        self.assertEqual(tally.waste_by_type['retry_loop']['count'], 2)
+        self.assertEqual(tally.waste_by_type['retry_loop']['total_tokens'], 160)
+
+    def test_format_matches_previous_output(self):
+        """Test format() with a detection list renders as before"""
+        self.assertEqual(self.formatter.format(TRACES, {}, True, DETECTIONS), EXPECTED_SUMMARY_ONLY)
+        self.assertEqual(self.formatter.format(TRACES, {}, False, DETECTIONS), EXPECTED_SUMMARY)
+
+    def test_format_tally_matches_format(self):
+        """Test rendering fed tallies gives the same output as format() with the list"""
+        self.assertEqual(self.formatter.format_tally(TRACES, {}, self._fed_tally(), True), EXPECTED_SUMMARY_ONLY)
+        self.assertEqual(self.formatter.format_tally(TRACES, {}, self._fed_tally(), False), EXPECTED_SUMMARY)
+
+    def test_no_detections(self):
+        """Test an empty tally reports no waste"""
+        self.assertEqual(
+            self.formatter.format_tally(TRACES, {}, WasteTally(), True),
+            "📊 2 traces | $0.50 total | $0.0000 waste\n✅ No waste patterns detected"
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()